@@ -1,19 +1,54 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from collections import defaultdict
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, ClassVar, Iterator, Optional, Type
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Iterator, Mapping, Optional, Type, cast
 
 from dcs.unittype import VehicleType
 from dcs.vehicles import vehicle_map
 
 from game.data.units import UnitClass
 from game.dcs.unittype import UnitType
+from game.version import GIT_SHA, VERSION
 
+_SKYNET_FIELDS = (
+    "can_engage_harm",
+    "can_engage_air_weapon",
+    "go_live_range_in_percent",
+    "engagement_zone",
+    "autonomous_behaviour",
+    "harm_detection_chance",
+)
 
-@dataclass
+# Boolean properties which skynet expects as lowercase "true"/"false".
+_LOWERCASE_SKYNET_FIELDS = frozenset({"can_engage_harm", "can_engage_air_weapon"})
+
+_UNIT_CLASS_BY_VALUE = {unit_class.value: unit_class for unit_class in UnitClass}
+
+# (field name, data key, default) for the GroundUnitType fields that are read directly
+# from the unit data without any conversion.
+_VARIANT_DATA_DEFAULTS = (
+    ("country_of_origin", "origin", "No data."),
+    ("manufacturer", "manufacturer", "No data."),
+    ("role", "role", "No data."),
+    ("price", "price", 1),
+    ("spawn_weight", "spawn_weight", 0),
+    ("reversed_heading", "reversed_heading", False),
+)
+
+# Only formatted for units whose data does not provide a description.
+_DEFAULT_DESCRIPTION_TEMPLATE = (
+    'No data. <a href="https://google.com/search?q=DCS+{query}">'
+    '<span style="color:#FFFFFF">Google {name}</span></a>'
+)
+
+
+# Frozen because from_data shares instances between unit types and hashes them by value.
+@dataclass(frozen=True, slots=True)
 class SkynetProperties:
     can_engage_harm: Optional[str] = None
     can_engage_air_weapon: Optional[str] = None
@@ -22,32 +57,72 @@ class SkynetProperties:
     autonomous_behaviour: Optional[str] = None
     harm_detection_chance: Optional[str] = None
 
+    _cached_dict: Optional[dict[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Many units share identical skynet settings (every launcher of a given SAM, for
+    # example), so from_data hands out one shared instance per distinct set of values.
+    _interned: ClassVar[dict[tuple[Optional[str], ...], SkynetProperties]] = {}
+
     @classmethod
     def from_data(cls, data: dict[str, Any]) -> SkynetProperties:
-        props = SkynetProperties()
-        if "can_engage_harm" in data:
-            props.can_engage_harm = str(data["can_engage_harm"]).lower()
-        if "can_engage_air_weapon" in data:
-            props.can_engage_air_weapon = str(data["can_engage_air_weapon"]).lower()
-        if "go_live_range_in_percent" in data:
-            props.go_live_range_in_percent = str(data["go_live_range_in_percent"])
-        if "engagement_zone" in data:
-            props.engagement_zone = str(data["engagement_zone"])
-        if "autonomous_behaviour" in data:
-            props.autonomous_behaviour = str(data["autonomous_behaviour"])
-        if "harm_detection_chance" in data:
-            props.harm_detection_chance = str(data["harm_detection_chance"])
+        if not data:
+            # Most ground units are not part of the IADS and have no skynet data.
+            return _EMPTY_SKYNET_PROPERTIES
+        get = data.get
+        values: list[Optional[str]] = []
+        for name in _SKYNET_FIELDS:
+            value = get(name)
+            if value is None:
+                values.append(None)
+                continue
+            # YAML gives us strings for most of these already.
+            if type(value) is not str:
+                value = str(value)
+            if name in _LOWERCASE_SKYNET_FIELDS:
+                # Only ever "true" or "false".
+                value = sys.intern(value.lower())
+            values.append(value)
+        key = tuple(values)
+        props = cls._interned.get(key)
+        if props is None:
+            props = cls(*key)
+            cls._interned[key] = props
         return props
 
+    def _key(self) -> tuple[Optional[str], ...]:
+        return tuple(getattr(self, name) for name in _SKYNET_FIELDS)
+
     def to_dict(self) -> dict[str, str]:
-        properties: dict[str, str] = {}
-        for key, value in self.__dict__.items():
-            if value is not None:
-                properties[key] = value
+        # The properties are immutable, so the result is computed once and shared.
+        # Callers must not modify the returned dict.
+        properties = self._cached_dict
+        if properties is None:
+            properties = {}
+            for name in _SKYNET_FIELDS:
+                value = getattr(self, name)
+                if value is not None:
+                    properties[name] = value
+            object.__setattr__(self, "_cached_dict", properties)
         return properties
 
     def __hash__(self) -> int:
-        return hash(id(self))
+        return hash(self._key())
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in _SKYNET_FIELDS}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # Saves from before this class used slots pickled the instance __dict__, which
+        # is also a mapping of field names to values.
+        for name in _SKYNET_FIELDS:
+            object.__setattr__(self, name, state.get(name))
+        object.__setattr__(self, "_cached_dict", None)
+
+
+_EMPTY_SKYNET_PROPERTIES = SkynetProperties()
+SkynetProperties._interned[_EMPTY_SKYNET_PROPERTIES._key()] = _EMPTY_SKYNET_PROPERTIES
 
 
 @dataclass(frozen=True)
@@ -59,78 +134,141 @@ class GroundUnitType(UnitType[Type[VehicleType]]):
     # Some units like few Launchers have to be placed backwards to be able to fire.
     reversed_heading: bool = False
 
-    _by_name: ClassVar[dict[str, GroundUnitType]] = {}
-    _by_unit_type: ClassVar[
-        dict[type[VehicleType], list[GroundUnitType]]
-    ] = defaultdict(list)
+    # Read-only once _load_all has completed.
+    _by_name: ClassVar[Mapping[str, GroundUnitType]] = {}
+    _by_unit_type: ClassVar[dict[type[VehicleType], list[GroundUnitType]]] = {}
+
+    # Identifies the unit data and Liberation version that were loaded. It is saved
+    # with each pickled unit so that loading a save made from identical data can skip
+    # refreshing the unit from the registry. None when the build can't be identified,
+    # in which case units are always refreshed.
+    _data_token: ClassVar[Optional[str]] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_data_token"] = GroundUnitType._data_token
+        return state
 
     def __setstate__(self, state: dict[str, Any]) -> None:
-        # Update any existing models with new data on load.
-        updated = GroundUnitType.named(state["variant_id"])
-        state.update(updated.__dict__)
+        token = state.pop("_data_token", None)
+        if not GroundUnitType._loaded:
+            GroundUnitType._load_all()
+        if token is None or token != GroundUnitType._data_token:
+            # Update any existing models with new data on load.
+            updated = GroundUnitType.named(state["variant_id"])
+            state.update(updated.__dict__)
         self.__dict__.update(state)
 
     @classmethod
     def register(cls, unit_type: GroundUnitType) -> None:
-        cls._by_name[unit_type.variant_id] = unit_type
-        cls._by_unit_type[unit_type.dcs_unit_type].append(unit_type)
+        # Registration only happens from _load_all, while _by_name is still a dict.
+        cast(dict[str, GroundUnitType], cls._by_name)[unit_type.variant_id] = unit_type
+        bucket = cls._by_unit_type.get(unit_type.dcs_unit_type)
+        if bucket is None:
+            bucket = cls._by_unit_type.setdefault(unit_type.dcs_unit_type, [])
+        bucket.append(unit_type)
+
+    @staticmethod
+    def _load_and_look_up(name: str) -> GroundUnitType:
+        GroundUnitType._load_all()
+        return GroundUnitType._by_name[name]
+
+    # Replaced with the registry's __getitem__ by _load_all so that named() doesn't
+    # need to check whether the data has been loaded on every call.
+    _look_up_by_name: ClassVar[Callable[[str], GroundUnitType]] = _load_and_look_up
 
     @classmethod
     def named(cls, name: str) -> GroundUnitType:
-        if not cls._loaded:
-            cls._load_all()
-        return cls._by_name[name]
+        return cls._look_up_by_name(name)
 
     @classmethod
     def for_dcs_type(cls, dcs_unit_type: Type[VehicleType]) -> Iterator[GroundUnitType]:
         if not cls._loaded:
             cls._load_all()
-        yield from cls._by_unit_type[dcs_unit_type]
+        # Callers use next() on the result, so this must stay an iterator, but there's
+        # no need for a generator frame over a list that already exists.
+        return iter(cls._by_unit_type.get(dcs_unit_type, ()))
 
     @staticmethod
     def each_dcs_type() -> Iterator[Type[VehicleType]]:
-        yield from vehicle_map.values()
+        # Not cached because mods add to vehicle_map when they are imported.
+        return iter(vehicle_map.values())
 
     @classmethod
     def _data_directory(cls) -> Path:
         return Path("resources/units/ground_units")
 
+    @classmethod
+    def _load_all(cls) -> None:
+        # Every known vehicle gets its bucket up front so that register only needs a
+        # single lookup per variant.
+        for dcs_unit_type in cls.each_dcs_type():
+            cls._by_unit_type.setdefault(dcs_unit_type, [])
+        cls._by_name = dict(cls._by_name)
+        super()._load_all()
+        cls._by_name = MappingProxyType(cls._by_name)
+        cls._look_up_by_name = cls._by_name.__getitem__
+        cls._data_token = cls._compute_data_token()
+
+    @classmethod
+    def _compute_data_token(cls) -> Optional[str]:
+        if GIT_SHA is None:
+            # Running from source. The version string doesn't change along with the
+            # loader code, so there's no way to tell whether a save's units are stale.
+            return None
+        digest = hashlib.sha256(VERSION.encode("utf-8"))
+        digest.update(",".join(f.name for f in fields(cls)).encode("utf-8"))
+        for path in sorted(cls._data_directory().glob("*.yaml")):
+            stat = path.stat()
+            digest.update(
+                f"{path.name}:{stat.st_mtime_ns}:{stat.st_size};".encode("utf-8")
+            )
+        return digest.hexdigest()
+
     @classmethod
     def _variant_from_dict(
         cls, vehicle: Type[VehicleType], variant_id: str, data: dict[str, Any]
     ) -> GroundUnitType:
-        try:
+        get = data.get
+        if "introduced" in data:
             introduction = data["introduced"]
             if introduction is None:
                 introduction = "N/A"
-        except KeyError:
+        else:
             introduction = "No data."
 
-        class_name = data.get("class")
+        class_name = get("class")
         if class_name is None:
             logging.warning(f"{vehicle.id} has no class")
             unit_class = UnitClass.UNKNOWN
         else:
-            unit_class = UnitClass(class_name)
+            try:
+                unit_class = _UNIT_CLASS_BY_VALUE[class_name]
+            except KeyError:
+                raise ValueError(f"{class_name!r} is not a valid UnitClass") from None
 
-        display_name = data.get("display_name", variant_id)
-        return GroundUnitType(
+        display_name = get("display_name", variant_id)
+        if "description" in data:
+            description = data["description"]
+        else:
+            description = _DEFAULT_DESCRIPTION_TEMPLATE.format(
+                query=display_name.replace(" ", "+"), name=display_name
+            )
+
+        # GroundUnitType is frozen, so the generated __init__ has to go through
+        # object.__setattr__ for every field. Fill the instance dict directly instead
+        # since this runs for every variant of every vehicle.
+        unit_type = object.__new__(cls)
+        unit_dict = unit_type.__dict__
+        unit_dict.update(
             dcs_unit_type=vehicle,
-            unit_class=unit_class,
-            spawn_weight=data.get("spawn_weight", 0),
             variant_id=variant_id,
             display_name=display_name,
-            description=data.get(
-                "description",
-                f"No data. <a href=\"https://google.com/search?q=DCS+{display_name.replace(' ', '+')}\"><span style=\"color:#FFFFFF\">Google {display_name}</span></a>",
-            ),
+            description=description,
             year_introduced=introduction,
-            country_of_origin=data.get("origin", "No data."),
-            manufacturer=data.get("manufacturer", "No data."),
-            role=data.get("role", "No data."),
-            price=data.get("price", 1),
-            skynet_properties=SkynetProperties.from_data(
-                data.get("skynet_properties", {})
-            ),
-            reversed_heading=data.get("reversed_heading", False),
+            unit_class=unit_class,
+            skynet_properties=SkynetProperties.from_data(get("skynet_properties", {})),
         )
+        for field_name, key, default in _VARIANT_DATA_DEFAULTS:
+            unit_dict[field_name] = get(key, default)
+        return unit_type
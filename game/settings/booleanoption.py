@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from functools import cache
 from typing import Any, Optional
 
 from .optiondescription import OptionDescription, SETTING_DESCRIPTION_KEY
@@ -9,6 +10,30 @@ class BooleanOption(OptionDescription):
     invert: bool
 
 
+@cache
+def _boolean_option_description(
+    page: str,
+    section: str,
+    text: str,
+    detail: Optional[str],
+    tooltip: Optional[str],
+    causes_expensive_game_update: bool,
+    remember_player_choice: bool,
+    invert: bool,
+) -> BooleanOption:
+    # BooleanOption is frozen, so identical declarations can share one description.
+    return BooleanOption(
+        page,
+        section,
+        text,
+        detail,
+        tooltip,
+        causes_expensive_game_update,
+        remember_player_choice,
+        invert,
+    )
+
+
 def boolean_option(
     text: str,
     page: str,
@@ -23,7 +48,7 @@ def boolean_option(
 ) -> bool:
     return field(
         metadata={
-            SETTING_DESCRIPTION_KEY: BooleanOption(
+            SETTING_DESCRIPTION_KEY: _boolean_option_description(
                 page,
                 section,
                 text,
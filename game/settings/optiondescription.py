@@ -1,9 +1,19 @@
+import textwrap
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
 
 SETTING_DESCRIPTION_KEY = "DCS_LIBERATION_SETTING_DESCRIPTION_KEY"
 
+_LABEL_WIDTH = 55
+_LABEL_TEMPLATE = "<strong>{text}</strong>"
+_LABEL_WITH_DETAIL_TEMPLATE = "<strong>{text}</strong><br />{detail}"
+
+
+def _wrap_html(text: str) -> str:
+    return "<br />".join(textwrap.wrap(text, width=_LABEL_WIDTH))
+
 
 @dataclass(frozen=True)
 class OptionDescription:
@@ -20,3 +30,15 @@ class OptionDescription:
     # appropriate for cross-game persistence (economy settings are, for example, usually
     # hinted by the campaign itself).
     remember_player_choice: bool
+
+    @cached_property
+    def html_label(self) -> str:
+        """The label text shown for this option in the settings window.
+
+        Wrapping is done once per option rather than every time the window is opened.
+        """
+        if self.detail is None:
+            return _LABEL_TEMPLATE.format(text=_wrap_html(self.text))
+        return _LABEL_WITH_DETAIL_TEMPLATE.format(
+            text=_wrap_html(self.text), detail=_wrap_html(self.detail)
+        )
@@ -1,8 +1,9 @@
 import logging
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from dataclasses import Field, dataclass, fields
 from datetime import timedelta
 from enum import Enum, unique
+from functools import cache
 from pathlib import Path
 from typing import Any, Optional, get_type_hints
 
@@ -569,6 +570,24 @@ class Settings:
 
     only_player_takeoff: bool = True  # Legacy parameter do not use
 
+    def add_observer(self, observer: Callable[[str, Any], None]) -> None:
+        """Registers a callback to be called with the name and value of every write.
+
+        Observers are not saved with the settings.
+        """
+        self.__dict__.setdefault("_observers", []).append(observer)
+
+    def remove_observer(self, observer: Callable[[str, Any], None]) -> None:
+        self.__dict__.get("_observers", []).remove(observer)
+
+    def notify(self, name: str, value: Any) -> None:
+        for observer in self.__dict__.get("_observers", ()):
+            observer(name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.notify(name, value)
+
     def save_player_settings(self) -> None:
         """Saves the player's global settings to the user directory."""
         settings: dict[str, Any] = {}
@@ -618,6 +637,11 @@ class Settings:
         """Returns the path to the player's global settings file."""
         return liberation_user_dir() / "settings.yaml"
 
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_observers", None)
+        return state
+
     def __setstate__(self, state: dict[str, Any]) -> None:
         # __setstate__ is called with the dict of the object being unpickled. We
         # can provide save compatibility for new settings options (which
@@ -632,36 +656,46 @@ class Settings:
     def _field_description(cls, settings_field: Field[Any]) -> OptionDescription:
         return settings_field.metadata[SETTING_DESCRIPTION_KEY]
 
+    # The settings schema is fixed once the class is defined, so the schema queries
+    # below are cached. The settings window makes several of them for every page it
+    # builds.
+
     @classmethod
-    def pages(cls) -> Iterator[str]:
-        seen: set[str] = set()
-        for settings_field in cls._user_fields():
-            description = cls._field_description(settings_field)
-            if description.page not in seen:
-                yield description.page
-                seen.add(description.page)
+    @cache
+    def pages(cls) -> tuple[str, ...]:
+        pages: list[str] = []
+        for _, description in cls.all_fields():
+            if description.page not in pages:
+                pages.append(description.page)
+        return tuple(pages)
 
     @classmethod
-    def sections(cls, page: str) -> Iterator[str]:
-        seen: set[str] = set()
-        for settings_field in cls._user_fields():
-            description = cls._field_description(settings_field)
-            if description.page == page and description.section not in seen:
-                yield description.section
-                seen.add(description.section)
+    @cache
+    def sections(cls, page: str) -> tuple[str, ...]:
+        sections: list[str] = []
+        for _, description in cls.all_fields():
+            if description.page == page and description.section not in sections:
+                sections.append(description.section)
+        return tuple(sections)
 
     @classmethod
-    def all_fields(cls) -> Iterator[tuple[str, OptionDescription]]:
-        for settings_field in cls._user_fields():
-            yield settings_field.name, cls._field_description(settings_field)
+    @cache
+    def all_fields(cls) -> tuple[tuple[str, OptionDescription], ...]:
+        return tuple(
+            (settings_field.name, cls._field_description(settings_field))
+            for settings_field in cls._user_fields()
+        )
 
     @classmethod
+    @cache
     def fields_for(
         cls, page: str, section: str
-    ) -> Iterator[tuple[str, OptionDescription]]:
-        for name, description in cls.all_fields():
-            if description.page == page and description.section == section:
-                yield name, description
+    ) -> tuple[tuple[str, OptionDescription], ...]:
+        return tuple(
+            (name, description)
+            for name, description in cls.all_fields()
+            if description.page == page and description.section == section
+        )
 
     @classmethod
     def _user_fields(cls) -> Iterator[Field[Any]]:
@@ -87,6 +87,8 @@ class QLiberationWindow(QMainWindow):
         self.liberation_map = QLiberationMap(
             self.game_model, ui_flags.dev_ui_webserver, self
         )
+        # The settings dialog is expensive to build, so it's kept around and reused.
+        self.settings_dialog: QSettingsWindow | None = None
 
         self.setGeometry(300, 100, 270, 100)
         self.updateWindowTitle()
@@ -422,6 +424,13 @@ class QLiberationWindow(QMainWindow):
     def setGame(self, game: Optional[Game]):
         try:
             self.game = game
+            # Don't let the reused settings dialog keep a previous game alive.
+            if self.settings_dialog is not None:
+                if game is None:
+                    self.settings_dialog.release()
+                    self.settings_dialog = None
+                else:
+                    self.settings_dialog.refresh(game)
             if self.info_panel is not None:
                 self.info_panel.setGame(game)
             self.sim_controller.set_game(game)
@@ -528,8 +537,11 @@ class QLiberationWindow(QMainWindow):
         self.subwindow.show()
 
     def showSettingsDialog(self) -> None:
-        self.dialog = QSettingsWindow(self.game)
-        self.dialog.show()
+        if self.settings_dialog is None:
+            self.settings_dialog = QSettingsWindow(self.game)
+        else:
+            self.settings_dialog.refresh(self.game)
+        self.settings_dialog.show()
 
     def showStatsDialog(self):
         self.dialog = QStatsWindow(self.game)
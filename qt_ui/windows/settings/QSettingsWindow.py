@@ -1,18 +1,18 @@
 import logging
-import textwrap
-from typing import Callable
+from functools import partial
+from typing import Any, Callable
 
-from PySide6.QtCore import QItemSelectionModel, QPoint, QSize, Qt
-from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtCore import QSignalMapper, QSize, Qt, QTimer
+from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import (
-    QAbstractItemView,
     QCheckBox,
     QComboBox,
     QDialog,
     QGridLayout,
     QGroupBox,
     QLabel,
-    QListView,
+    QListWidget,
+    QListWidgetItem,
     QPushButton,
     QSpinBox,
     QStackedLayout,
@@ -39,26 +39,62 @@ from qt_ui.widgets.spinsliders import FloatSpinSlider, TimeInputs
 from qt_ui.windows.GameUpdateSignal import GameUpdateSignal
 from qt_ui.windows.settings.plugins import PluginOptionsPage, PluginsPage
 
+# Settings that require a game update when they change. The cheat settings are not auto
+# settings, but they change what is shown on the map.
+GAME_UPDATE_SETTINGS = frozenset(
+    [
+        name
+        for name, description in Settings.all_fields()
+        if description.causes_expensive_game_update
+    ]
+    + [
+        "show_red_ato",
+        "enable_frontline_cheats",
+        "enable_base_capture_cheat",
+        "enable_runway_state_cheat",
+    ]
+)
+
+# Text, style and amount (in millions) of each money cheat button.
+MONEY_CHEAT_BUTTONS = (
+    ("Cheat +25M", "btn-success", 25),
+    ("Cheat +50M", "btn-success", 50),
+    ("Cheat +100M", "btn-success", 100),
+    ("Cheat +200M", "btn-success", 200),
+    ("Cheat +500M", "btn-success", 500),
+    ("Cheat +1000M", "btn-success", 1000),
+    ("Cheat -25M", "btn-danger", -25),
+    ("Cheat -50M", "btn-danger", -50),
+    ("Cheat -100M", "btn-danger", -100),
+    ("Cheat -200M", "btn-danger", -200),
+)
+
 
 class CheatSettingsBox(QGroupBox):
-    def __init__(self, game: Game, apply_settings: Callable[[], None]) -> None:
+    def __init__(self, game: Game) -> None:
         super().__init__("Cheat Settings")
         self.main_layout = QVBoxLayout()
         self.setLayout(self.main_layout)
 
         self.red_ato_checkbox = QCheckBox()
         self.red_ato_checkbox.setChecked(game.settings.show_red_ato)
-        self.red_ato_checkbox.toggled.connect(apply_settings)
+        self.red_ato_checkbox.toggled.connect(
+            partial(setattr, game.settings, "show_red_ato")
+        )
 
         self.frontline_cheat_checkbox = QCheckBox()
         self.frontline_cheat_checkbox.setChecked(game.settings.enable_frontline_cheats)
-        self.frontline_cheat_checkbox.toggled.connect(apply_settings)
+        self.frontline_cheat_checkbox.toggled.connect(
+            partial(setattr, game.settings, "enable_frontline_cheats")
+        )
 
         self.base_capture_cheat_checkbox = QCheckBox()
         self.base_capture_cheat_checkbox.setChecked(
             game.settings.enable_base_capture_cheat
         )
-        self.base_capture_cheat_checkbox.toggled.connect(apply_settings)
+        self.base_capture_cheat_checkbox.toggled.connect(
+            partial(setattr, game.settings, "enable_base_capture_cheat")
+        )
 
         self.red_ato = QLabeledWidget("Show Red ATO:", self.red_ato_checkbox)
         self.main_layout.addLayout(self.red_ato)
@@ -74,7 +110,9 @@ class CheatSettingsBox(QGroupBox):
         self.base_runway_state_cheat_checkbox.setChecked(
             game.settings.enable_runway_state_cheat
         )
-        self.base_runway_state_cheat_checkbox.toggled.connect(apply_settings)
+        self.base_runway_state_cheat_checkbox.toggled.connect(
+            partial(setattr, game.settings, "enable_runway_state_cheat")
+        )
         self.main_layout.addLayout(
             QLabeledWidget(
                 "Enable runway state cheat:", self.base_runway_state_cheat_checkbox
@@ -83,22 +121,6 @@ class CheatSettingsBox(QGroupBox):
 
         self.main_layout.addLayout(self.base_capture_cheat)
 
-    @property
-    def show_red_ato(self) -> bool:
-        return self.red_ato_checkbox.isChecked()
-
-    @property
-    def show_frontline_cheat(self) -> bool:
-        return self.frontline_cheat_checkbox.isChecked()
-
-    @property
-    def show_base_capture_cheat(self) -> bool:
-        return self.base_capture_cheat_checkbox.isChecked()
-
-    @property
-    def enable_runway_state_cheat(self) -> bool:
-        return self.base_runway_state_cheat_checkbox.isChecked()
-
 
 class AutoSettingsLayout(QGridLayout):
     def __init__(
@@ -106,112 +128,123 @@ class AutoSettingsLayout(QGridLayout):
         page: str,
         section: str,
         settings: Settings,
-        write_full_settings: Callable[[], None],
     ) -> None:
         super().__init__()
         self.settings = settings
-        self.write_full_settings = write_full_settings
 
         for row, (name, description) in enumerate(Settings.fields_for(page, section)):
             self.add_label(row, description)
-            if isinstance(description, BooleanOption):
-                self.add_checkbox_for(row, name, description)
-            elif isinstance(description, ChoicesOption):
-                self.add_combobox_for(row, name, description)
-            elif isinstance(description, BoundedFloatOption):
-                self.add_float_spin_slider_for(row, name, description)
-            elif isinstance(description, BoundedIntOption):
-                self.add_spinner_for(row, name, description)
-            elif isinstance(description, MinutesOption):
-                self.add_duration_controls_for(row, name, description)
-            else:
-                raise TypeError(f"Unhandled option type: {description}")
+            try:
+                add_controls = _CONTROL_BUILDERS[type(description)]
+            except KeyError:
+                raise TypeError(f"Unhandled option type: {description}") from None
+            add_controls(self, row, name, description)
+
+    def setter_for(self, name: str) -> Callable[[Any], None]:
+        return partial(setattr, self.settings, name)
 
     def add_label(self, row: int, description: OptionDescription) -> None:
-        wrapped_title = "<br />".join(textwrap.wrap(description.text, width=55))
-        text = f"<strong>{wrapped_title}</strong>"
-        if description.detail is not None:
-            wrapped = "<br />".join(textwrap.wrap(description.detail, width=55))
-            text += f"<br />{wrapped}"
-        label = QLabel(text)
+        label = QLabel(description.html_label)
         if description.tooltip is not None:
             label.setToolTip(description.tooltip)
         self.addWidget(label, row, 0)
 
     def add_checkbox_for(self, row: int, name: str, description: BooleanOption) -> None:
-        def on_toggle(value: bool) -> None:
-            if description.invert:
-                value = not value
-            self.settings.__dict__[name] = value
-            if description.causes_expensive_game_update:
-                self.write_full_settings()
-
         checkbox = QCheckBox()
-        value = self.settings.__dict__[name]
+        value = getattr(self.settings, name)
         if description.invert:
             value = not value
         checkbox.setChecked(value)
-        checkbox.toggled.connect(on_toggle)
+        checkbox.toggled.connect(
+            partial(self.on_checkbox_toggled, self.setter_for(name), description)
+        )
         self.addWidget(checkbox, row, 1, Qt.AlignRight)
 
+    def on_checkbox_toggled(
+        self, setter: Callable[[Any], None], description: BooleanOption, value: bool
+    ) -> None:
+        if description.invert:
+            value = not value
+        setter(value)
+
     def add_combobox_for(self, row: int, name: str, description: ChoicesOption) -> None:
         combobox = QComboBox()
-
-        def on_changed(index: int) -> None:
-            self.settings.__dict__[name] = combobox.itemData(index)
-
         for text, value in description.choices.items():
             combobox.addItem(text, value)
         combobox.setCurrentText(
-            description.text_for_value(self.settings.__dict__[name])
+            description.text_for_value(getattr(self.settings, name))
+        )
+        combobox.currentIndexChanged.connect(
+            partial(self.on_combobox_changed, self.setter_for(name), combobox)
         )
-        combobox.currentIndexChanged.connect(on_changed)
         self.addWidget(combobox, row, 1, Qt.AlignRight)
 
+    def on_combobox_changed(
+        self, setter: Callable[[Any], None], combobox: QComboBox, index: int
+    ) -> None:
+        setter(combobox.itemData(index))
+
     def add_float_spin_slider_for(
         self, row: int, name: str, description: BoundedFloatOption
     ) -> None:
         spinner = FloatSpinSlider(
             description.min,
             description.max,
-            self.settings.__dict__[name],
+            getattr(self.settings, name),
             divisor=description.divisor,
         )
-
-        def on_changed() -> None:
-            self.settings.__dict__[name] = spinner.value
-
-        spinner.spinner.valueChanged.connect(on_changed)
+        spinner.spinner.valueChanged.connect(
+            partial(self.on_float_spin_slider_changed, self.setter_for(name), spinner)
+        )
         self.addLayout(spinner, row, 1, Qt.AlignRight)
 
+    def on_float_spin_slider_changed(
+        self, setter: Callable[[Any], None], spinner: FloatSpinSlider, _value: int
+    ) -> None:
+        setter(spinner.value)
+
     def add_spinner_for(
         self, row: int, name: str, description: BoundedIntOption
     ) -> None:
-        def on_changed(value: int) -> None:
-            self.settings.__dict__[name] = value
-            if description.causes_expensive_game_update:
-                self.write_full_settings()
-
         spinner = QSpinBox()
         spinner.setMinimum(description.min)
         spinner.setMaximum(description.max)
-        spinner.setValue(self.settings.__dict__[name])
-
-        spinner.valueChanged.connect(on_changed)
+        spinner.setValue(getattr(self.settings, name))
+        if description.causes_expensive_game_update:
+            # Only commit typed values once editing is finished (enter or focus loss)
+            # so each keystroke doesn't trigger a game update. The arrows and mouse
+            # wheel still update the setting immediately.
+            spinner.setKeyboardTracking(False)
+
+        spinner.valueChanged.connect(self.setter_for(name))
         self.addWidget(spinner, row, 1, Qt.AlignRight)
 
     def add_duration_controls_for(
         self, row: int, name: str, description: MinutesOption
     ) -> None:
         inputs = TimeInputs(
-            self.settings.__dict__[name], description.min, description.max
+            getattr(self.settings, name), description.min, description.max
+        )
+        inputs.spinner.valueChanged.connect(
+            partial(self.on_duration_changed, self.setter_for(name), inputs)
         )
+        self.addLayout(inputs, row, 1, Qt.AlignRight)
+
+    def on_duration_changed(
+        self, setter: Callable[[Any], None], inputs: TimeInputs, _value: int
+    ) -> None:
+        setter(inputs.value)
 
-        def on_changed() -> None:
-            self.settings.__dict__[name] = inputs.value
 
-        inputs.spinner.valueChanged.connect(on_changed)
-        self.addLayout(inputs, row, 1, Qt.AlignRight)
+_CONTROL_BUILDERS: dict[
+    type[OptionDescription], Callable[[AutoSettingsLayout, int, str, Any], None]
+] = {
+    BooleanOption: AutoSettingsLayout.add_checkbox_for,
+    ChoicesOption: AutoSettingsLayout.add_combobox_for,
+    BoundedFloatOption: AutoSettingsLayout.add_float_spin_slider_for,
+    BoundedIntOption: AutoSettingsLayout.add_spinner_for,
+    MinutesOption: AutoSettingsLayout.add_duration_controls_for,
+}
 
 
 class AutoSettingsGroup(QGroupBox):
@@ -220,10 +253,9 @@ class AutoSettingsGroup(QGroupBox):
         page: str,
         section: str,
         settings: Settings,
-        write_full_settings: Callable[[], None],
     ) -> None:
         super().__init__(section)
-        self.setLayout(AutoSettingsLayout(page, section, settings, write_full_settings))
+        self.setLayout(AutoSettingsLayout(page, section, settings))
 
 
 class AutoSettingsPageLayout(QVBoxLayout):
@@ -231,15 +263,12 @@ class AutoSettingsPageLayout(QVBoxLayout):
         self,
         page: str,
         settings: Settings,
-        write_full_settings: Callable[[], None],
     ) -> None:
         super().__init__()
         self.setAlignment(Qt.AlignTop)
 
         for section in Settings.sections(page):
-            self.addWidget(
-                AutoSettingsGroup(page, section, settings, write_full_settings)
-            )
+            self.addWidget(AutoSettingsGroup(page, section, settings))
 
 
 class AutoSettingsPage(QWidget):
@@ -247,16 +276,13 @@ class AutoSettingsPage(QWidget):
         self,
         page: str,
         settings: Settings,
-        write_full_settings: Callable[[], None],
     ) -> None:
         super().__init__()
         layout = QVBoxLayout()
         self.setLayout(layout)
 
         scroll_content = QWidget()
-        scroll_content.setLayout(
-            AutoSettingsPageLayout(page, settings, write_full_settings)
-        )
+        scroll_content.setLayout(AutoSettingsPageLayout(page, settings))
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setWidget(scroll_content)
@@ -265,16 +291,22 @@ class AutoSettingsPage(QWidget):
 
 
 class QSettingsWindow(QDialog):
+    MAX_BUILT_PAGES = 2
+
     def __init__(self, game: Game):
         super().__init__()
 
         self.game = game
-        self.pluginsPage = None
-        self.pluginsOptionsPage = None
+        self.game.settings.add_observer(self.on_setting_changed)
+        self.game_update_pending = False
 
-        self.pages: dict[str, AutoSettingsPage] = {}
-        for page in Settings.pages():
-            self.pages[page] = AutoSettingsPage(page, game.settings, self.applySettings)
+        # Pages are only built when they are selected, and only the most recently
+        # shown ones are kept alive. Every other index of the stacked layout holds an
+        # empty placeholder widget. Evicted pages are rebuilt from the current
+        # settings if they're selected again.
+        self.page_factories: list[Callable[[], QWidget]] = []
+        # Least recently shown first.
+        self.built_pages: list[int] = []
 
         self.setModal(True)
         self.setWindowTitle("Settings")
@@ -286,114 +318,147 @@ class QSettingsWindow(QDialog):
     def initUi(self):
         self.layout = QGridLayout()
 
-        self.categoryList = QListView()
+        self.categoryList = QListWidget()
         self.right_layout = QStackedLayout()
 
         self.categoryList.setMaximumWidth(175)
+        self.categoryList.setIconSize(QSize(32, 32))
 
-        self.categoryModel = QStandardItemModel(self.categoryList)
+        # Install the layouts first so the placeholder pages are parented to the
+        # dialog as soon as they're added.
+        self.layout.addWidget(self.categoryList, 0, 0, 1, 1)
+        self.layout.addLayout(self.right_layout, 0, 1, 5, 1)
+        self.setLayout(self.layout)
 
-        self.categoryList.setIconSize(QSize(32, 32))
+        generator_icon = CONST.ICONS["Generator"]
+        for name in Settings.pages():
+            self.add_page(
+                name,
+                CONST.ICONS.get(name, generator_icon),
+                partial(self.create_settings_page, name),
+            )
 
-        for name, page in self.pages.items():
-            page_item = QStandardItem(name)
-            if name in CONST.ICONS:
-                page_item.setIcon(CONST.ICONS[name])
-            else:
-                page_item.setIcon(CONST.ICONS["Generator"])
-            page_item.setEditable(False)
-            page_item.setSelectable(True)
-            self.categoryModel.appendRow(page_item)
-            self.right_layout.addWidget(page)
-
-        self.initCheatLayout()
-        cheat = QStandardItem("Cheat Menu")
-        cheat.setIcon(CONST.ICONS["Cheat"])
-        cheat.setEditable(False)
-        cheat.setSelectable(True)
-        self.categoryModel.appendRow(cheat)
-        self.right_layout.addWidget(self.cheatPage)
-
-        self.pluginsPage = PluginsPage(self.game.lua_plugin_manager)
-        plugins = QStandardItem("LUA Plugins")
-        plugins.setIcon(CONST.ICONS["Plugins"])
-        plugins.setEditable(False)
-        plugins.setSelectable(True)
-        self.categoryModel.appendRow(plugins)
-        self.right_layout.addWidget(self.pluginsPage)
-
-        self.pluginsOptionsPage = PluginOptionsPage(self.game.lua_plugin_manager)
-        pluginsOptions = QStandardItem("LUA Plugins Options")
-        pluginsOptions.setIcon(CONST.ICONS["PluginsOptions"])
-        pluginsOptions.setEditable(False)
-        pluginsOptions.setSelectable(True)
-        self.categoryModel.appendRow(pluginsOptions)
-        self.right_layout.addWidget(self.pluginsOptionsPage)
-
-        self.categoryList.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.categoryList.setModel(self.categoryModel)
-        self.categoryList.selectionModel().setCurrentIndex(
-            self.categoryList.indexAt(QPoint(1, 1)), QItemSelectionModel.Select
+        self.add_page("Cheat Menu", CONST.ICONS["Cheat"], self.initCheatLayout)
+        self.add_page(
+            "LUA Plugins",
+            CONST.ICONS["Plugins"],
+            lambda: PluginsPage(self.game.lua_plugin_manager),
         )
-        self.categoryList.selectionModel().selectionChanged.connect(
-            self.onSelectionChanged
+        self.add_page(
+            "LUA Plugins Options",
+            CONST.ICONS["PluginsOptions"],
+            lambda: PluginOptionsPage(self.game.lua_plugin_manager),
         )
 
-        self.layout.addWidget(self.categoryList, 0, 0, 1, 1)
-        self.layout.addLayout(self.right_layout, 0, 1, 5, 1)
+        self.categoryList.setCurrentRow(0)
+        self.categoryList.currentRowChanged.connect(self.show_page)
+        self.show_page(0)
 
-        self.setLayout(self.layout)
+    def add_page(
+        self, name: str, icon: QPixmap, factory: Callable[[], QWidget]
+    ) -> None:
+        self.categoryList.addItem(QListWidgetItem(icon, name))
+        self.right_layout.addWidget(QWidget())
+        self.page_factories.append(factory)
 
-    def initCheatLayout(self):
+    def refresh(self, game: Game) -> None:
+        """Reuses the dialog to show the settings of the given game.
+
+        Settings are only edited through this dialog, so the pages that are already
+        built are still current unless a different game has been loaded since.
+        """
+        if game is self.game:
+            return
+
+        self.game.settings.remove_observer(self.on_setting_changed)
+        self.game = game
+        self.game.settings.add_observer(self.on_setting_changed)
+        current_index = self.right_layout.currentIndex()
+        for index in self.built_pages:
+            self.replace_page(index, QWidget())
+        self.built_pages.clear()
+        self.show_page(current_index)
+
+    def release(self) -> None:
+        """Closes the dialog and detaches it from its game so it can be destroyed."""
+        self.game.settings.remove_observer(self.on_setting_changed)
+        self.close()
+        self.deleteLater()
+
+    def create_settings_page(self, name: str) -> QWidget:
+        return AutoSettingsPage(name, self.game.settings)
+
+    def show_page(self, index: int) -> None:
+        # Swapping pages inserts and removes several widgets. Suspend painting until
+        # all of it is done so the dialog is only repainted once.
+        self.setUpdatesEnabled(False)
+        try:
+            if index in self.built_pages:
+                self.built_pages.remove(index)
+            else:
+                self.replace_page(index, self.page_factories[index]())
+            self.built_pages.append(index)
+            self.right_layout.setCurrentIndex(index)
+
+            while len(self.built_pages) > self.MAX_BUILT_PAGES:
+                self.replace_page(self.built_pages.pop(0), QWidget())
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def replace_page(self, index: int, page: QWidget) -> None:
+        old_page = self.right_layout.widget(index)
+        self.right_layout.insertWidget(index, page)
+        self.right_layout.removeWidget(old_page)
+        old_page.deleteLater()
+
+    def initCheatLayout(self) -> QWidget:
         self.cheatPage = QWidget()
         self.cheatLayout = QVBoxLayout()
         self.cheatPage.setLayout(self.cheatLayout)
 
-        self.cheat_options = CheatSettingsBox(self.game, self.applySettings)
-        self.cheatLayout.addWidget(self.cheat_options)
+        self.cheatLayout.addWidget(CheatSettingsBox(self.game))
 
         self.moneyCheatBox = QGroupBox("Money Cheat")
         self.moneyCheatBox.setAlignment(Qt.AlignTop)
         self.moneyCheatBoxLayout = QGridLayout()
         self.moneyCheatBox.setLayout(self.moneyCheatBoxLayout)
 
-        cheats_amounts = [25, 50, 100, 200, 500, 1000, -25, -50, -100, -200]
-        for i, amount in enumerate(cheats_amounts):
-            if amount > 0:
-                btn = QPushButton("Cheat +" + str(amount) + "M")
-                btn.setProperty("style", "btn-success")
-            else:
-                btn = QPushButton("Cheat " + str(amount) + "M")
-                btn.setProperty("style", "btn-danger")
-            btn.clicked.connect(self.cheatLambda(amount))
-            self.moneyCheatBoxLayout.addWidget(btn, i / 2, i % 2)
+        # All the buttons share a single connection to cheatMoney. The mapper is owned
+        # by the page so it goes away with it.
+        self.moneyCheatMapper = QSignalMapper(self.cheatPage)
+        self.moneyCheatMapper.mappedInt.connect(self.cheatMoney)
+
+        for i, (text, style, amount) in enumerate(MONEY_CHEAT_BUTTONS):
+            btn = QPushButton(text)
+            btn.setProperty("style", style)
+            btn.clicked.connect(self.moneyCheatMapper.map)
+            self.moneyCheatMapper.setMapping(btn, amount)
+            self.moneyCheatBoxLayout.addWidget(btn, i // 2, i % 2)
         self.cheatLayout.addWidget(self.moneyCheatBox, stretch=1)
+        return self.cheatPage
 
-    def cheatLambda(self, amount):
-        return lambda: self.cheatMoney(amount)
-
-    def cheatMoney(self, amount):
+    def cheatMoney(self, amount: int) -> None:
         logging.info("CHEATING FOR AMOUNT : " + str(amount) + "M")
         self.game.blue.budget += amount
         GameUpdateSignal.get_instance().updateGame(self.game)
 
-    def applySettings(self):
-        self.game.settings.show_red_ato = self.cheat_options.show_red_ato
-        self.game.settings.enable_frontline_cheats = (
-            self.cheat_options.show_frontline_cheat
-        )
-        self.game.settings.enable_base_capture_cheat = (
-            self.cheat_options.show_base_capture_cheat
-        )
-        self.game.settings.enable_runway_state_cheat = (
-            self.cheat_options.enable_runway_state_cheat
-        )
-
+    def on_setting_changed(self, name: str, _value: Any) -> None:
+        if name in GAME_UPDATE_SETTINGS:
+            self.schedule_game_update()
+
+    def schedule_game_update(self) -> None:
+        # Updating the game is expensive and several settings may change in the same
+        # event loop iteration, so defer it and only update once for all of them.
+        if not self.game_update_pending:
+            self.game_update_pending = True
+            QTimer.singleShot(0, self.update_game)
+
+    def update_game(self) -> None:
+        # This stays on the GUI thread. compute_unculled_zones reads the settings and
+        # ATOs that this dialog and the rest of the UI mutate, and it's only a walk
+        # over the front lines, control points and packages.
+        self.game_update_pending = False
         events = GameUpdateEvents()
         self.game.compute_unculled_zones(events)
         EventStream.put_nowait(events)
         GameUpdateSignal.get_instance().updateGame(self.game)
-
-    def onSelectionChanged(self):
-        index = self.categoryList.selectionModel().currentIndex().row()
-        self.right_layout.setCurrentIndex(index)
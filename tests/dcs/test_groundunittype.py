@@ -0,0 +1,171 @@
+import pickle
+from dataclasses import fields
+from typing import Any
+
+import pytest
+import yaml
+from dcs.vehicles import Armor
+
+from game.data.units import UnitClass
+from game.dcs import groundunittype
+from game.dcs.groundunittype import GroundUnitType, SkynetProperties
+
+
+def test_variant_from_dict_sets_every_field() -> None:
+    # _variant_from_dict bypasses the generated __init__, so make sure it still
+    # populates exactly the declared fields.
+    unit_type = GroundUnitType._variant_from_dict(
+        Armor.M_1_Abrams, "M-1 Abrams", {"class": "Tank", "price": 10}
+    )
+    assert unit_type.__dict__.keys() == {f.name for f in fields(GroundUnitType)}
+    assert unit_type == GroundUnitType(
+        dcs_unit_type=Armor.M_1_Abrams,
+        variant_id="M-1 Abrams",
+        display_name="M-1 Abrams",
+        description=(
+            'No data. <a href="https://google.com/search?q=DCS+M-1+Abrams">'
+            '<span style="color:#FFFFFF">Google M-1 Abrams</span></a>'
+        ),
+        year_introduced="No data.",
+        country_of_origin="No data.",
+        manufacturer="No data.",
+        role="No data.",
+        price=10,
+        unit_class=UnitClass.TANK,
+        spawn_weight=0,
+        skynet_properties=SkynetProperties(),
+    )
+
+
+# (field, unit data key, default) for the fields copied straight from the unit data.
+FIELDS_FROM_DATA = [
+    ("country_of_origin", "origin", "No data."),
+    ("manufacturer", "manufacturer", "No data."),
+    ("role", "role", "No data."),
+    ("price", "price", 1),
+    ("spawn_weight", "spawn_weight", 0),
+    ("reversed_heading", "reversed_heading", False),
+]
+
+
+def variant_data(unit_type: GroundUnitType) -> dict[str, Any]:
+    unit_id = unit_type.dcs_unit_type.id
+    path = GroundUnitType._data_directory() / f"{unit_id}.yaml"
+    with path.open(encoding="utf-8") as data_file:
+        data = yaml.safe_load(data_file)
+    variants = data.get("variants", {unit_id: {}})
+    return data | (variants[unit_type.variant_id] or {})
+
+
+def test_loaded_variants_match_unit_data() -> None:
+    # Check every variant loaded from the real unit data against the YAML it came from.
+    GroundUnitType.named("M1A2 Abrams")
+    field_names = {f.name for f in fields(GroundUnitType)}
+    for unit_type in GroundUnitType._by_name.values():
+        assert unit_type.__dict__.keys() - {"eplrs_capable"} == field_names
+        data = variant_data(unit_type)
+        for field_name, key, default in FIELDS_FROM_DATA:
+            assert getattr(unit_type, field_name) == data.get(key, default), (
+                unit_type.variant_id,
+                field_name,
+            )
+
+        if "introduced" not in data:
+            assert unit_type.year_introduced == "No data."
+        elif data["introduced"] is None:
+            assert unit_type.year_introduced == "N/A"
+        else:
+            assert unit_type.year_introduced == data["introduced"]
+
+        if "class" in data:
+            assert unit_type.unit_class is UnitClass(data["class"])
+        else:
+            assert unit_type.unit_class is UnitClass.UNKNOWN
+
+        assert unit_type.display_name == data.get("display_name", unit_type.variant_id)
+        if "description" in data:
+            assert unit_type.description == data["description"]
+
+
+def unpickled_from(state: dict[str, Any]) -> GroundUnitType:
+    unit_type = GroundUnitType.__new__(GroundUnitType)
+    unit_type.__setstate__(state)
+    return unit_type
+
+
+def test_matching_data_token_skips_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    abrams = GroundUnitType.named("M1A2 Abrams")
+    monkeypatch.setattr(GroundUnitType, "_data_token", "token")
+    state = abrams.__getstate__()
+    assert state["_data_token"] == "token"
+
+    state["display_name"] = "Stale"
+    unit_type = unpickled_from(state)
+    assert unit_type.display_name == "Stale"
+    assert "_data_token" not in unit_type.__dict__
+
+
+def test_mismatched_data_token_refreshes(monkeypatch: pytest.MonkeyPatch) -> None:
+    abrams = GroundUnitType.named("M1A2 Abrams")
+    monkeypatch.setattr(GroundUnitType, "_data_token", "token")
+    state = abrams.__getstate__() | {"_data_token": "other", "display_name": "Stale"}
+
+    unit_type = unpickled_from(state)
+    assert unit_type.display_name == abrams.display_name
+    assert "_data_token" not in unit_type.__dict__
+
+
+def test_state_without_data_token_refreshes(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Saves from before the token was added.
+    abrams = GroundUnitType.named("M1A2 Abrams")
+    monkeypatch.setattr(GroundUnitType, "_data_token", "token")
+    state = dict(abrams.__dict__, display_name="Stale")
+
+    unit_type = unpickled_from(state)
+    assert unit_type.display_name == abrams.display_name
+    assert "_data_token" not in unit_type.__dict__
+
+
+def test_pickle_round_trip_does_not_store_data_token() -> None:
+    abrams = GroundUnitType.named("M1A2 Abrams")
+    unit_type = pickle.loads(pickle.dumps(abrams))
+    assert unit_type == abrams
+    assert "_data_token" not in unit_type.__dict__
+
+
+def test_no_data_token_without_git_sha(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(groundunittype, "GIT_SHA", None)
+    assert GroundUnitType._compute_data_token() is None
+
+
+def test_skynet_properties_pickle_round_trip() -> None:
+    properties = SkynetProperties(engagement_zone="100", can_engage_harm="true")
+    properties.to_dict()
+
+    restored = pickle.loads(pickle.dumps(properties))
+    assert restored == properties
+    assert restored.to_dict() == {"engagement_zone": "100", "can_engage_harm": "true"}
+
+
+def test_skynet_properties_unpickle_dict_state() -> None:
+    # Saves from before SkynetProperties used slots pickled the instance __dict__.
+    properties = SkynetProperties.__new__(SkynetProperties)
+    properties.__setstate__(
+        {
+            "can_engage_harm": "false",
+            "can_engage_air_weapon": None,
+            "go_live_range_in_percent": "80",
+            "engagement_zone": None,
+            "autonomous_behaviour": None,
+            "harm_detection_chance": None,
+            "_cached_dict": {"stale": "value"},
+        }
+    )
+    assert properties._cached_dict is None
+    assert properties == SkynetProperties(
+        can_engage_harm="false", go_live_range_in_percent="80"
+    )
+    assert properties.to_dict() == {
+        "can_engage_harm": "false",
+        "go_live_range_in_percent": "80",
+    }
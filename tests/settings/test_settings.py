@@ -0,0 +1,37 @@
+import pickle
+from typing import Any
+
+from game.settings import Settings
+
+
+def test_observers_see_every_write() -> None:
+    settings = Settings()
+    writes: list[tuple[str, Any]] = []
+    settings.add_observer(lambda name, value: writes.append((name, value)))
+
+    settings.show_red_ato = True
+    settings.perf_culling_distance = 50
+    assert writes == [("show_red_ato", True), ("perf_culling_distance", 50)]
+
+
+def test_removed_observer_is_not_called() -> None:
+    settings = Settings()
+    writes: list[str] = []
+
+    def observer(name: str, _value: Any) -> None:
+        writes.append(name)
+
+    settings.add_observer(observer)
+    settings.remove_observer(observer)
+    settings.show_red_ato = True
+    assert not writes
+
+
+def test_observers_are_not_pickled() -> None:
+    settings = Settings()
+    settings.add_observer(lambda name, value: None)
+    settings.show_red_ato = True
+
+    restored = pickle.loads(pickle.dumps(settings))
+    assert restored == settings
+    assert "_observers" not in restored.__dict__